@@ -0,0 +1,147 @@
+"""
+Benchmarks du pipeline de chargement et de recherche sur un profil synthétique.
+
+Usage:
+    python benchmarks/bench_pipeline.py [--bookmarks 5000] [--repeat 5] [--json out.json] [--compare base.json]
+
+Chaque étape est chronométrée plusieurs fois (minimum et médiane retenus), puis
+exécutée une fois de plus sous tracemalloc pour mesurer le pic mémoire Python
+(les allocations internes de Qt et de SQLite ne sont pas comptées).
+Les paramètres et la graine sont enregistrés dans le JSON pour comparer les exécutions.
+"""
+import os
+import sys
+import json
+import time
+import platform
+import argparse
+import tempfile
+import statistics
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dao import DAO
+from formater import convert_to_new_format, sort_by_dir_type, search_bookmarks
+from synthetic import generate_profile
+
+
+def measure(func, repeat:int) -> dict:
+    """Chronomètre func et mesure son pic mémoire."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"min_s": min(timings), "median_s": statistics.median(timings), "peak_kib": peak / 1024}
+
+
+def make_window():
+    """Crée une MainWindow hors écran, ou None si PySide6 est indisponible."""
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    try:
+        from PySide6.QtWidgets import QApplication
+        from main import MainWindow
+    except ImportError:
+        return None
+    # Les chemins d'icônes de main.py sont relatifs à la racine du dépôt
+    os.chdir(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    app = QApplication.instance() or QApplication([])
+    window = MainWindow()
+    window._bench_app = app  # Garde l'application en vie avec la fenêtre
+    return window
+
+
+def run(profile_dir:str, repeat:int, search:str) -> dict:
+    # Un DAO gardé ouvert pour mesurer la lecture avec connexions et requêtes déjà préparées
+    session_dao = DAO(firefox_profile_dir_path=profile_dir)
+    # Données intermédiaires calculées une fois pour isoler chaque étape
+    bookmarks_dict = session_dao.to_dict()
+    converted = convert_to_new_format(bookmarks_dict)
+    sorted_data = sort_by_dir_type(converted)
+    bookmark_id = int(session_dao.get_bookmarks()["id"].iloc[0])
+    # La première modification copie places.sqlite (sauvegarde) : faite avant les mesures
+    session_dao.update_bookmark_title(bookmark_id, "Titre de benchmark")
+
+    def to_dict_cold():
+        with DAO(firefox_profile_dir_path=profile_dir) as dao:
+            return dao.to_dict()
+
+    stages = {
+        # Même nom qu'avant l'ajout des connexions de session, pour --compare
+        "DAO.to_dict": to_dict_cold,
+        "DAO.to_dict (session)": session_dao.to_dict,
+        "DAO.update_title": lambda: session_dao.update_bookmark_title(bookmark_id, "Titre de benchmark"),
+        "convert_to_new_format": lambda: convert_to_new_format(bookmarks_dict),
+        "sort_by_dir_type": lambda: sort_by_dir_type(converted),
+        "search_bookmarks": lambda: search_bookmarks(sorted_data, name_pattern=search),
+    }
+    window = make_window()
+    if window is not None:
+        stages["MainWindow.load_data"] = lambda: window.load_data(sorted_data, element=window.ui.view_tree)
+
+    with session_dao:
+        return {name: measure(func, repeat) for name, func in stages.items()}
+
+
+def print_results(results:dict, baseline:dict=None) -> None:
+    if baseline:
+        missing = sorted(set(results) ^ set(baseline))
+        if missing:
+            print(f"Attention : étapes absentes d'une des deux exécutions : {', '.join(missing)}", file=sys.stderr)
+    header = f"{'étape':<24} {'min (ms)':>10} {'médiane (ms)':>13} {'pic (KiB)':>11}"
+    print(header + (f" {'vs base':>8}" if baseline else ""))
+    for name, result in results.items():
+        line = f"{name:<24} {result['min_s'] * 1000:>10.2f} {result['median_s'] * 1000:>13.2f} {result['peak_kib']:>11.0f}"
+        if baseline and name in baseline:
+            line += f" {result['min_s'] / baseline[name]['min_s']:>7.2f}x"
+        print(line)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--bookmarks", type=int, default=5000, help="Marque-pages générés")
+    parser.add_argument("--depth", type=int, default=4, help="Profondeur des dossiers")
+    parser.add_argument("--fanout", type=int, default=3, help="Sous-dossiers par dossier")
+    parser.add_argument("--history", type=int, default=10000, help="Pages d'historique non marquées")
+    parser.add_argument("--icon-sizes", default="16,32", help="Tailles d'icônes séparées par des virgules")
+    parser.add_argument("--seed", type=int, default=0, help="Graine aléatoire")
+    parser.add_argument("--repeat", type=int, default=5, help="Répétitions par étape")
+    parser.add_argument("--search", default="python", help="Motif utilisé pour search_bookmarks")
+    parser.add_argument("--json", default=None, help="Écrit les résultats dans ce fichier JSON")
+    parser.add_argument("--compare", default=None, help="JSON d'une exécution précédente à comparer")
+    args = parser.parse_args()
+
+    params = {
+        "bookmarks": args.bookmarks, "depth": args.depth, "fanout": args.fanout,
+        "history": args.history, "icon_sizes": [int(s) for s in args.icon_sizes.split(",") if s],
+        "seed": args.seed, "repeat": args.repeat, "search": args.search,
+    }
+    with tempfile.TemporaryDirectory() as profile_dir:
+        generate_profile(
+            profile_dir, bookmarks=args.bookmarks, depth=args.depth, fanout=args.fanout,
+            history=args.history, icon_sizes=tuple(params["icon_sizes"]), seed=args.seed
+        )
+        results = run(profile_dir, args.repeat, args.search)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            previous = json.load(f)
+        if previous["params"] != params:
+            print("Attention : paramètres différents de l'exécution comparée", file=sys.stderr)
+        baseline = previous["results"]
+    print_results(results, baseline)
+
+    if args.json:
+        report = {"params": params, "python": platform.python_version(), "platform": platform.platform(), "results": results}
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
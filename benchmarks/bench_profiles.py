@@ -0,0 +1,68 @@
+"""
+Mesure le temps de chargement de N profils selon l'exécuteur utilisé.
+
+Usage:
+    python benchmarks/bench_profiles.py [--firefox-dir DIR | --synthetic 5000] [--max-count 8] [--repeat 3]
+
+Les N premiers profils découverts dans profiles.ini sont chargés, N allant
+de 1 au nombre de profils disponibles (limité par --max-count). Avec
+--synthetic, --max-count profils synthétiques de la taille donnée sont
+générés dans un dossier temporaire.
+"""
+import os
+import sys
+import time
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from profiles_ini import discover_profiles
+from profiles import load_profiles
+from synthetic import generate_firefox_dir
+
+EXECUTORS = ("serial", "thread", "process")
+
+
+def bench(available:list, max_count:int, repeat:int) -> list:
+    results = []
+    for count in range(1, max_count + 1):
+        profiles = available[:count]
+        for executor in EXECUTORS:
+            timings = []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                _, errors = load_profiles(profiles, executor=executor)
+                timings.append(time.perf_counter() - start)
+            for profile_id, error in errors.items():
+                print(f"Profil {profile_id} ignoré : {error}", file=sys.stderr)
+            results.append((count, executor, min(timings)))
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--firefox-dir", default=None, help="Dossier contenant profiles.ini")
+    parser.add_argument("--synthetic", type=int, default=None, help="Génère des profils synthétiques de N marque-pages")
+    parser.add_argument("--max-count", type=int, default=8, help="Nombre maximal de profils chargés")
+    parser.add_argument("--repeat", type=int, default=3, help="Répétitions par mesure (le minimum est retenu)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        firefox_dir = args.firefox_dir
+        if args.synthetic is not None:
+            firefox_dir = tmp_dir
+            generate_firefox_dir(firefox_dir, profiles=args.max_count, bookmarks=args.synthetic)
+        available = discover_profiles(firefox_dir)
+        if not available:
+            sys.exit("Aucun profil trouvé dans profiles.ini")
+        if len(available) < args.max_count:
+            print(f"Seulement {len(available)} profils disponibles", file=sys.stderr)
+
+        print(f"{'profils':>8} {'exécuteur':>10} {'temps (s)':>10}")
+        for count, executor, elapsed in bench(available, min(args.max_count, len(available)), args.repeat):
+            print(f"{count:>8} {executor:>10} {elapsed:>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,279 @@
+"""
+Génère des profils Firefox synthétiques (places.sqlite et favicons.sqlite)
+qui suivent le schéma de Firefox, pour des benchmarks reproductibles.
+
+Usage:
+    python benchmarks/synthetic.py DOSSIER [--profiles 1] [--bookmarks 5000] [--depth 4] ...
+"""
+import os
+import zlib
+import random
+import struct
+import sqlite3
+import argparse
+
+PLACES_SCHEMA = '''
+    CREATE TABLE moz_origins (
+        id INTEGER PRIMARY KEY, prefix TEXT NOT NULL, host TEXT NOT NULL,
+        frecency INTEGER NOT NULL, recalc_frecency INTEGER NOT NULL DEFAULT 0,
+        alt_frecency INTEGER, recalc_alt_frecency INTEGER NOT NULL DEFAULT 0,
+        UNIQUE (prefix, host)
+    );
+    CREATE TABLE moz_places (
+        id INTEGER PRIMARY KEY, url LONGVARCHAR, title LONGVARCHAR, rev_host LONGVARCHAR,
+        visit_count INTEGER DEFAULT 0, hidden INTEGER DEFAULT 0 NOT NULL,
+        typed INTEGER DEFAULT 0 NOT NULL, frecency INTEGER DEFAULT -1 NOT NULL,
+        last_visit_date INTEGER, guid TEXT, foreign_count INTEGER DEFAULT 0 NOT NULL,
+        url_hash INTEGER DEFAULT 0 NOT NULL, description TEXT, preview_image_url TEXT,
+        site_name TEXT, origin_id INTEGER REFERENCES moz_origins(id),
+        recalc_frecency INTEGER NOT NULL DEFAULT 0, alt_frecency INTEGER,
+        recalc_alt_frecency INTEGER NOT NULL DEFAULT 0
+    );
+    CREATE TABLE moz_historyvisits (
+        id INTEGER PRIMARY KEY, from_visit INTEGER, place_id INTEGER, visit_date INTEGER,
+        visit_type INTEGER, session INTEGER, source INTEGER DEFAULT 0 NOT NULL,
+        triggeringPlaceId INTEGER
+    );
+    CREATE TABLE moz_bookmarks (
+        id INTEGER PRIMARY KEY, type INTEGER, fk INTEGER DEFAULT NULL, parent INTEGER,
+        position INTEGER, title LONGVARCHAR, keyword_id INTEGER, folder_type TEXT,
+        dateAdded INTEGER, lastModified INTEGER, guid TEXT,
+        syncStatus INTEGER NOT NULL DEFAULT 0, syncChangeCounter INTEGER NOT NULL DEFAULT 1
+    );
+    CREATE UNIQUE INDEX moz_places_url_hashindex ON moz_places (url_hash, url);
+    CREATE UNIQUE INDEX moz_places_guid_uniqueindex ON moz_places (guid);
+    CREATE INDEX moz_historyvisits_placedateindex ON moz_historyvisits (place_id, visit_date);
+    CREATE INDEX moz_bookmarks_itemindex ON moz_bookmarks (fk, type);
+    CREATE INDEX moz_bookmarks_parentindex ON moz_bookmarks (parent, position);
+    CREATE UNIQUE INDEX moz_bookmarks_guid_uniqueindex ON moz_bookmarks (guid);
+'''
+
+FAVICONS_SCHEMA = '''
+    CREATE TABLE moz_icons (
+        id INTEGER PRIMARY KEY, icon_url TEXT NOT NULL, fixed_icon_url_hash INTEGER NOT NULL,
+        width INTEGER NOT NULL DEFAULT 0, root INTEGER NOT NULL DEFAULT 0, color INTEGER,
+        expire_ms INTEGER NOT NULL DEFAULT 0, data BLOB
+    );
+    CREATE TABLE moz_pages_w_icons (
+        id INTEGER PRIMARY KEY, page_url TEXT NOT NULL, page_url_hash INTEGER NOT NULL
+    );
+    CREATE TABLE moz_icons_to_pages (
+        page_id INTEGER NOT NULL, icon_id INTEGER NOT NULL, expire_ms INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (page_id, icon_id),
+        FOREIGN KEY (page_id) REFERENCES moz_pages_w_icons ON DELETE CASCADE,
+        FOREIGN KEY (icon_id) REFERENCES moz_icons ON DELETE CASCADE
+    ) WITHOUT ROWID;
+    CREATE INDEX moz_icons_iconurlhashindex ON moz_icons (fixed_icon_url_hash);
+    CREATE INDEX moz_pages_w_icons_urlhashindex ON moz_pages_w_icons (page_url_hash);
+'''
+
+# Dossiers racines créés par Firefox : (id, parent, titre, guid)
+ROOT_FOLDERS = [
+    (1, 0, "", "root________"),
+    (2, 1, "menu", "menu________"),
+    (3, 1, "toolbar", "toolbar_____"),
+    (4, 1, "tags", "tags________"),
+    (5, 1, "unfiled", "unfiled_____"),
+    (6, 1, "mobile", "mobile______"),
+]
+# Dossiers racines dans lesquels des marque-pages sont générés
+BOOKMARK_ROOTS = [2, 3, 5]
+
+WORDS = [
+    "python", "firefox", "recette", "musique", "actualité", "docs", "tutoriel", "projet",
+    "vidéo", "archive", "outil", "blog", "forum", "wiki", "cours", "api", "photo", "voyage",
+]
+HOSTS = [
+    "www.youtube.com", "github.com", "docs.python.org", "fr.wikipedia.org", "stackoverflow.com",
+    "developer.mozilla.org", "www.reddit.com", "news.ycombinator.com", "example.org",
+]
+
+BASE_TIME_US = 1_600_000_000_000_000  # Horodatage de référence (microsecondes, comme Firefox)
+
+
+def make_png(size:int, rgb:tuple) -> bytes:
+    """Construit une image PNG carrée d'une seule couleur (décodable par QPixmap)."""
+    def chunk(kind:bytes, payload:bytes) -> bytes:
+        return struct.pack(">I", len(payload)) + kind + payload + struct.pack(">I", zlib.crc32(kind + payload))
+    row = b"\x00" + bytes(rgb) * size
+    header = struct.pack(">IIBBBBB", size, size, 8, 2, 0, 0, 0)
+    return b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", header) + chunk(b"IDAT", zlib.compress(row * size)) + chunk(b"IEND", b"")
+
+
+def url_hash(url:str) -> int:
+    # Firefox utilise son propre hachage ; un CRC32 suffit pour remplir les index
+    return zlib.crc32(url.encode("utf-8"))
+
+
+def make_guid(rng:random.Random) -> str:
+    alphabet = "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789-_"
+    return "".join(rng.choice(alphabet) for _ in range(12))
+
+
+def generate_profile(profile_dir:str, bookmarks:int=5000, depth:int=4, fanout:int=3,
+                     history:int=10000, icon_sizes:tuple=(16, 32), icon_ratio:float=0.8,
+                     seed:int=0) -> None:
+    """
+    Crée places.sqlite et favicons.sqlite dans profile_dir.
+
+    Args:
+        profile_dir (str): Dossier du profil (créé si absent, bases écrasées)
+        bookmarks (int): Nombre de marque-pages (type 1)
+        depth (int): Profondeur maximale des dossiers sous chaque racine
+        fanout (int): Nombre de sous-dossiers par dossier
+        history (int): Nombre de pages d'historique supplémentaires (non marquées)
+        icon_sizes (tuple): Tailles (px) des icônes générées pour chaque page
+        icon_ratio (float): Proportion de pages ayant une icône
+        seed (int): Graine du générateur aléatoire
+    """
+    rng = random.Random(seed)
+    os.makedirs(profile_dir, exist_ok=True)
+    places_path = os.path.join(profile_dir, "places.sqlite")
+    favicons_path = os.path.join(profile_dir, "favicons.sqlite")
+    for path in (places_path, favicons_path):
+        if os.path.exists(path):
+            os.remove(path)
+
+    # Pages : les marque-pages d'abord, puis l'historique seul
+    origins = {host: i + 1 for i, host in enumerate(HOSTS)}
+    places = []
+    for place_id in range(1, bookmarks + history + 1):
+        host = rng.choice(HOSTS)
+        url = f"https://{host}/{rng.choice(WORDS)}/{place_id}"
+        title = f"{rng.choice(WORDS).capitalize()} {rng.choice(WORDS)} {place_id}"
+        places.append((place_id, url, title, host[::-1] + ".", origins[host], make_guid(rng)))
+
+    # Arborescence des dossiers sous menu, toolbar et unfiled
+    folder_rows = []
+    next_id = len(ROOT_FOLDERS) + 1
+    leaf_parents = list(BOOKMARK_ROOTS)
+    level = list(BOOKMARK_ROOTS)
+    for _ in range(depth):
+        next_level = []
+        for parent in level:
+            for position in range(fanout):
+                folder_rows.append((next_id, parent, position, f"{rng.choice(WORDS).capitalize()} {next_id}"))
+                next_level.append(next_id)
+                next_id += 1
+        leaf_parents.extend(next_level)
+        level = next_level
+
+    conn = sqlite3.connect(places_path)
+    conn.executescript(PLACES_SCHEMA)
+    conn.executemany(
+        "INSERT INTO moz_origins (id, prefix, host, frecency) VALUES (?, 'https://', ?, 100)",
+        [(origin_id, host) for host, origin_id in origins.items()]
+    )
+    conn.executemany(
+        "INSERT INTO moz_places (id, url, title, rev_host, visit_count, frecency, last_visit_date, "
+        "guid, foreign_count, url_hash, origin_id) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+        [
+            (place_id, url, title, rev_host, 1, 100, BASE_TIME_US + place_id,
+             guid, 1 if place_id <= bookmarks else 0, url_hash(url), origin_id)
+            for place_id, url, title, rev_host, origin_id, guid in places
+        ]
+    )
+    conn.executemany(
+        "INSERT INTO moz_historyvisits (place_id, visit_date, visit_type) VALUES (?, ?, 1)",
+        [(place[0], BASE_TIME_US + place[0]) for place in places]
+    )
+    conn.executemany(
+        "INSERT INTO moz_bookmarks (id, type, parent, position, title, dateAdded, lastModified, guid) "
+        "VALUES (?, 2, ?, ?, ?, ?, ?, ?)",
+        [(bm_id, parent, max(bm_id - 2, 0), title, BASE_TIME_US, BASE_TIME_US, guid)
+         for bm_id, parent, title, guid in ROOT_FOLDERS]
+    )
+    conn.executemany(
+        "INSERT INTO moz_bookmarks (id, type, parent, position, title, dateAdded, lastModified, guid) "
+        "VALUES (?, 2, ?, ?, ?, ?, ?, ?)",
+        [(bm_id, parent, position, title, BASE_TIME_US, BASE_TIME_US, make_guid(rng))
+         for bm_id, parent, position, title in folder_rows]
+    )
+    # Firefox garde des positions contiguës à partir de 0 dans chaque dossier :
+    # les marque-pages suivent les sous-dossiers déjà placés
+    next_position = {}
+    for _, parent, _, _ in folder_rows:
+        next_position[parent] = next_position.get(parent, 0) + 1
+    bookmark_rows = []
+    for place_id, url, title, _, _, _ in places[:bookmarks]:
+        parent = rng.choice(leaf_parents)
+        position = next_position.get(parent, 0)
+        next_position[parent] = position + 1
+        bookmark_rows.append((next_id, place_id, parent, position, title,
+                              BASE_TIME_US + place_id, BASE_TIME_US + place_id, make_guid(rng)))
+        next_id += 1
+    conn.executemany(
+        "INSERT INTO moz_bookmarks (id, type, fk, parent, position, title, dateAdded, lastModified, guid) "
+        "VALUES (?, 1, ?, ?, ?, ?, ?, ?, ?)",
+        bookmark_rows
+    )
+    conn.commit()
+    conn.close()
+
+    # Icônes : une image par taille pour chaque page retenue
+    conn = sqlite3.connect(favicons_path)
+    conn.executescript(FAVICONS_SCHEMA)
+    icon_id = 1
+    pages, icons, links = [], [], []
+    for place_id, url, _, _, _, _ in places:
+        if rng.random() >= icon_ratio:
+            continue
+        pages.append((place_id, url, url_hash(url)))
+        color = (rng.randrange(256), rng.randrange(256), rng.randrange(256))
+        for size in icon_sizes:
+            icon_url = f"{url}/favicon-{size}.png"
+            icons.append((icon_id, icon_url, url_hash(icon_url), size, make_png(size, color)))
+            links.append((place_id, icon_id))
+            icon_id += 1
+    conn.executemany("INSERT INTO moz_pages_w_icons (id, page_url, page_url_hash) VALUES (?, ?, ?)", pages)
+    conn.executemany(
+        "INSERT INTO moz_icons (id, icon_url, fixed_icon_url_hash, width, data) VALUES (?, ?, ?, ?, ?)",
+        icons
+    )
+    conn.executemany("INSERT INTO moz_icons_to_pages (page_id, icon_id) VALUES (?, ?)", links)
+    conn.commit()
+    conn.close()
+
+
+def generate_firefox_dir(firefox_dir:str, profiles:int=1, seed:int=0, **kwargs) -> None:
+    """
+    Crée un dossier Firefox complet (profiles.ini + profils synthétiques),
+    avec la disposition Linux (profils à la racine, chemins relatifs).
+    Les arguments supplémentaires sont transmis à generate_profile.
+    """
+    os.makedirs(firefox_dir, exist_ok=True)
+    lines = ["[General]", "StartWithLastProfile=1", "Version=2", ""]
+    for i in range(profiles):
+        dirname = f"synth{i:04d}.bench-{i}"
+        generate_profile(os.path.join(firefox_dir, dirname), seed=seed + i, **kwargs)
+        lines += [f"[Profile{i}]", f"Name=bench-{i}", "IsRelative=1", f"Path={dirname}"]
+        if i == 0:
+            lines.append("Default=1")
+        lines.append("")
+    with open(os.path.join(firefox_dir, "profiles.ini"), "w", encoding="utf-8") as ini:
+        ini.write("\n".join(lines))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("firefox_dir", help="Dossier de sortie (contiendra profiles.ini)")
+    parser.add_argument("--profiles", type=int, default=1, help="Nombre de profils")
+    parser.add_argument("--bookmarks", type=int, default=5000, help="Marque-pages par profil")
+    parser.add_argument("--depth", type=int, default=4, help="Profondeur des dossiers")
+    parser.add_argument("--fanout", type=int, default=3, help="Sous-dossiers par dossier")
+    parser.add_argument("--history", type=int, default=10000, help="Pages d'historique non marquées")
+    parser.add_argument("--icon-sizes", default="16,32", help="Tailles d'icônes séparées par des virgules")
+    parser.add_argument("--icon-ratio", type=float, default=0.8, help="Proportion de pages avec icône")
+    parser.add_argument("--seed", type=int, default=0, help="Graine aléatoire")
+    args = parser.parse_args()
+
+    generate_firefox_dir(
+        args.firefox_dir, profiles=args.profiles, seed=args.seed, bookmarks=args.bookmarks,
+        depth=args.depth, fanout=args.fanout, history=args.history,
+        icon_sizes=tuple(int(size) for size in args.icon_sizes.split(",") if size),
+        icon_ratio=args.icon_ratio
+    )
+
+
+if __name__ == "__main__":
+    main()
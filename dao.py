@@ -2,20 +2,110 @@ import sqlite3
 import pandas as pd
 import datetime
 import os
+import pathlib
+from instrumentation import span, count, timed
+from profiles_ini import find_profile
+
+UPDATE_TITLE_QUERY = "UPDATE moz_bookmarks SET title = ? WHERE id = ?"
+
+class ConnectionManager:
+    """
+    Connexions SQLite d'un profil, ouvertes à la demande et gardées pour toute la session.
+    Chaque base a une connexion de lecture (mode=ro et query_only) et au besoin une
+    connexion d'écriture (mode=rw). Aucune des deux ne crée de base absente.
+    sqlite3 met en cache les requêtes préparées par connexion : réutiliser les mêmes
+    connexions (et les mêmes textes de requête) évite de les recompiler à chaque chargement.
+    """
+    # Firefox peut verrouiller la base pendant ses écritures : on attend au lieu d'échouer
+    BUSY_TIMEOUT_MS = 5000
+    READ_PRAGMAS = (
+        "PRAGMA query_only = ON",
+        "PRAGMA mmap_size = 268435456",  # 256 Mio projetés en mémoire
+        "PRAGMA cache_size = -65536",    # 64 Mio de cache de pages
+        "PRAGMA temp_store = MEMORY",    # Tables temporaires des requêtes récursives en mémoire
+    )
+
+    def __init__(self, database_paths:dict) -> None:
+        self.database_paths = database_paths
+        self.read_connections = {}
+        self.write_connections = {}
+
+    def __connect__(self, name:str, mode:str) -> sqlite3.Connection:
+        # URI "file:" pour choisir le mode d'ouverture (ro : lecture seule, rw : sans création)
+        uri = pathlib.Path(os.path.abspath(self.database_paths[name])).as_uri() + f"?mode={mode}"
+        conn = sqlite3.connect(uri, uri=True)
+        conn.execute(f"PRAGMA busy_timeout = {self.BUSY_TIMEOUT_MS}")
+        return conn
+
+    def read(self, name:str) -> sqlite3.Connection:
+        """Retourne la connexion de lecture de la base name (ex: "places")."""
+        if name not in self.read_connections:
+            conn = self.__connect__(name, "ro")
+            # Autocommit : un lecteur ne garde jamais de transaction ouverte (pas de BEGIN implicite
+            # laissé par une écriture refusée, qui bloquerait la connexion d'écriture)
+            conn.isolation_level = None
+            # Pragmas de lecture ; query_only double mode=ro par sécurité
+            for pragma in self.READ_PRAGMAS:
+                conn.execute(pragma)
+            self.read_connections[name] = conn
+        return self.read_connections[name]
+
+    def write(self, name:str) -> sqlite3.Connection:
+        """Retourne la connexion d'écriture de la base name, à utiliser comme context manager de transaction."""
+        if name not in self.write_connections:
+            self.write_connections[name] = self.__connect__(name, "rw")
+        return self.write_connections[name]
+
+    def close(self) -> None:
+        for connections in (self.read_connections, self.write_connections):
+            for conn in connections.values():
+                conn.close()
+            connections.clear()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
 
 class DAO:
-    def __init__(self, profile_id:str, firefox_profile_dir_path:str=None, backup_dir_path:str=None) -> None:
-        profile_path = f"C:/Users/{os.environ['username']}/AppData/Roaming/Mozilla/Firefox/Profiles/{profile_id}/"
-        self.firefox_profile_dir_path = profile_path if firefox_profile_dir_path is None else firefox_profile_dir_path
-        self.backup_dir_path = profile_path + "bm_editor_backup" if backup_dir_path is None else backup_dir_path
+    def __init__(self, profile_id:str=None, firefox_profile_dir_path:str=None, backup_dir_path:str=None) -> None:
+        if firefox_profile_dir_path is None:
+            # Retrouve le dossier du profil via profiles.ini (profil par défaut si profile_id est None)
+            firefox_profile_dir_path = find_profile(profile_id).path
+        # Les chemins ci-dessous sont construits par concaténation : garantit le séparateur final
+        self.firefox_profile_dir_path = os.path.join(firefox_profile_dir_path, "")
+        self.backup_dir_path = self.firefox_profile_dir_path + "bm_editor_backup" if backup_dir_path is None else backup_dir_path
         # Initialise le DAO avec le chemin d'accès à la base de données de Firefox
         self.database_path_places = self.firefox_profile_dir_path + "places.sqlite"
         self.database_path_favicons = self.firefox_profile_dir_path + "favicons.sqlite"
-        # Connecte à la base de données SQLite
-        self.conn_places = sqlite3.connect(self.database_path_places)
-        self.conn_favicons = sqlite3.connect(self.database_path_favicons)
+        # Les connexions SQLite sont ouvertes à la demande et fermées par close()
+        self.connections = ConnectionManager({
+            "places": self.database_path_places,
+            "favicons": self.database_path_favicons,
+        })
         self.backup_already_maked:bool = False
 
+    @property
+    def conn_places(self) -> sqlite3.Connection:
+        return self.connections.read("places")
+
+    @property
+    def conn_favicons(self) -> sqlite3.Connection:
+        return self.connections.read("favicons")
+
+    def close(self) -> None:
+        # Ferme toutes les connexions (lecture et écriture)
+        self.connections.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
     def __remove_old_backup__(self) -> None:
         bklist = os.listdir(self.backup_dir_path)
         while len(bklist) > 100:
@@ -48,12 +138,18 @@ class DAO:
             )
             SELECT id, parent, title, fk FROM moz_bookmarks WHERE type = 1
         '''
-        return pd.read_sql_query(query, self.conn_places)
+        with span("dao.get_bookmarks"):
+            bookmarks = pd.read_sql_query(query, self.conn_places)
+        count("dao.rows.bookmarks", len(bookmarks))
+        return bookmarks
 
     def get_places(self):
         # Requête SQL pour extraire les URLs depuis la table moz_places de Firefox
         query = "SELECT id, url, preview_image_url FROM moz_places"
-        return pd.read_sql_query(query, self.conn_places)
+        with span("dao.get_places"):
+            places = pd.read_sql_query(query, self.conn_places)
+        count("dao.rows.places", len(places))
+        return places
 
     def get_folders(self):
         # Requête SQL pour extraire les dossiers depuis la table moz_bookmarks de Firefox
@@ -69,7 +165,10 @@ class DAO:
             )
             SELECT id, path FROM folders
         '''
-        return pd.read_sql_query(query, self.conn_places)
+        with span("dao.get_folders"):
+            folders = pd.read_sql_query(query, self.conn_places)
+        count("dao.rows.folders", len(folders))
+        return folders
     
     def get_icons(self):
         query = '''
@@ -77,7 +176,10 @@ class DAO:
             INNER JOIN moz_icons_to_pages mitp ON mitp.icon_id = mi.id 
             INNER JOIN moz_pages_w_icons mpwi ON mpwi.id = mitp.page_id
         '''
-        return pd.read_sql_query(query, self.conn_favicons)
+        with span("dao.get_icons"):
+            icons = pd.read_sql_query(query, self.conn_favicons)
+        count("dao.rows.icons", len(icons))
+        return icons
 
     def get_bookmarks_with_places_and_folders(self) -> list:
         # Obtenir les marque-pages, les URL et les dossiers
@@ -85,18 +187,19 @@ class DAO:
         places = self.get_places()
         folders = self.get_folders()
         favicons = self.get_icons()
-        # Jointure pour lier les marque-pages aux URL
-        bookmarks = bookmarks.merge(places, how='left', left_on='fk', right_on='id')
-        # Jointure pour lier les marque-pages à leur dossier parent
-        bookmarks = bookmarks.merge(folders, how='left', left_on='parent', right_on='id')
-
-        bookmarks = bookmarks.merge(favicons, how='left', left_on='url', right_on='url')
-        # Créer une liste de tuples pour les marque-pages avec leur ID, titre, URL et chemin
-        bookmarks = [(row.id, row.title, row.url, row.path, row.icon) for row in bookmarks.itertuples()]
-        # Fermer la connexion à la base de données SQLite
-        self.conn_places.close()
+        with span("dao.merge"):
+            # Jointure pour lier les marque-pages aux URL
+            bookmarks = bookmarks.merge(places, how='left', left_on='fk', right_on='id')
+            # Jointure pour lier les marque-pages à leur dossier parent
+            bookmarks = bookmarks.merge(folders, how='left', left_on='parent', right_on='id')
+
+            bookmarks = bookmarks.merge(favicons, how='left', left_on='url', right_on='url')
+        with span("dao.to_tuples"):
+            # Créer une liste de tuples pour les marque-pages avec leur ID, titre, URL et chemin
+            bookmarks = [(row.id, row.title, row.url, row.path, row.icon) for row in bookmarks.itertuples()]
         return bookmarks
 
+    @timed("dao.to_list")
     def to_list(self) -> list:
         # Obtenir les marque-pages avec les URL et les dossiers
         bookmarks = self.get_bookmarks_with_places_and_folders()
@@ -108,6 +211,7 @@ class DAO:
         # Retourner une liste de tous les marque-pages, triée par ordre alphabétique du titre
         return [x[i] for i in x.keys()]
     
+    @timed("dao.to_dict")
     def to_dict(self) -> dict:
         result = {}
         for id, name, url, dirpath, icon in self.to_list():
@@ -126,24 +230,29 @@ class DAO:
                 nested_dict["__files_list__"] = []
             nested_dict["__files_list__"].append((id, name, url, dirpath, icon))
         # Renvoyer le dictionnaire résultant
-        if list(result.keys())[0] == "":
+        if result and list(result.keys())[0] == "":
             return result[""]
         else:
             return result
 
     def update_bookmark_title(self, bookmark_id: int, new_title: str):
         self.__make_backup__()
-        # Met à jour le titre d'un marque-page avec un nouvel intitulé
-        query = "UPDATE moz_bookmarks SET title = ? WHERE id = ?"
-        self.conn_places.execute(query, (new_title, bookmark_id))
-        self.conn_places.commit()
+        # Met à jour le titre d'un marque-page avec un nouvel intitulé (commit à la sortie du bloc)
+        with span("dao.update_bookmark_title"), self.connections.write("places") as conn:
+            conn.execute(UPDATE_TITLE_QUERY, (new_title, int(bookmark_id)))
 
     def update_titles(self, contains:str, replace_by:str=""):
         # Requête pour récupérer tous les marque-pages contenant " - YouTube" dans leur titre
         bookmarks = self.get_bookmarks()
         youtube_bookmarks = bookmarks[bookmarks['title'].str.contains(contains, na=False)]
 
-        # Mise à jour de chaque titre
-        for _, row in youtube_bookmarks.iterrows():
-            new_title = row['title'].replace(contains, replace_by)
-            self.update_bookmark_title(row['id'], new_title)
+        # Mise à jour de tous les titres dans une seule transaction
+        updates = [
+            (row.title.replace(contains, replace_by), int(row.id))
+            for row in youtube_bookmarks.itertuples()
+        ]
+        if not updates:
+            return
+        self.__make_backup__()
+        with span("dao.update_titles", rows=len(updates)), self.connections.write("places") as conn:
+            conn.executemany(UPDATE_TITLE_QUERY, updates)
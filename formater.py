@@ -1,6 +1,9 @@
 import re
+import copy
+from instrumentation import timed
 
 
+@timed("formater.convert_to_new_format")
 def convert_to_new_format(data):
     """
     Convertit la structure de données d'origine vers le nouveau format JSON.
@@ -69,6 +72,7 @@ def convert_to_new_format(data):
     
     return result
 
+@timed("formater.sort_by_dir_type")
 def sort_by_dir_type(data, sort_by_alpha: bool = True):
     """
     Trie récursivement les données en mettant les répertoires en premier,
@@ -95,20 +99,20 @@ def sort_by_dir_type(data, sort_by_alpha: bool = True):
         
         return (type_priority, name)
     
+    def sort_items(items):
+        """Trie la liste en place puis récursivement les sous-listes des répertoires"""
+        items.sort(key=sort_key)
+        for item in items:
+            if item["type"] == "dir" and "urls" in item:
+                sort_items(item["urls"])
+    
     # Copie profonde pour ne pas modifier les données d'origine
-    import copy
     sorted_data = copy.deepcopy(data)
-    
-    # Trie la liste principale
-    sorted_data.sort(key=sort_key)
-    
-    # Trie récursivement les sous-listes dans les répertoires
-    for item in sorted_data:
-        if item["type"] == "dir" and "urls" in item:
-            item["urls"] = sort_by_dir_type(item["urls"], sort_by_alpha)
+    sort_items(sorted_data)
     
     return sorted_data
 
+@timed("formater.search_bookmarks")
 def search_bookmarks(data, name_pattern="", url_pattern="", is_specific_url=False):
     """
     Recherche dans les bookmarks selon les critères donnés et préserve la hiérarchie.
@@ -184,3 +188,39 @@ def search_bookmarks(data, name_pattern="", url_pattern="", is_specific_url=Fals
     filtered_data = filter_recursive(data)
     # Puis nettoyer les répertoires vides
     return clean_empty_dirs(filtered_data)
+
+@timed("formater.merge_profiles")
+def merge_profiles(data_by_profile):
+    """
+    Fusionne les marque-pages de plusieurs profils en une seule arborescence.
+    Chaque profil devient un répertoire racine et chaque élément reçoit une clé
+    "profile" indiquant le profil d'origine.
+    
+    Args:
+        data_by_profile (dict): Identifiant du profil -> liste au format converti
+        
+    Returns:
+        list: Liste de répertoires (un par profil) au format converti,
+        à construire une seule fois : search_bookmarks s'applique directement
+        à cette liste et conserve la clé "profile" des éléments trouvés
+    """
+    def tag_items(items, profile_name):
+        """Copie récursivement les items en ajoutant le profil d'origine"""
+        tagged = []
+        for item in items:
+            new_item = item.copy()
+            new_item["profile"] = profile_name
+            if item["type"] == "dir" and "urls" in item:
+                new_item["urls"] = tag_items(item["urls"], profile_name)
+            tagged.append(new_item)
+        return tagged
+    
+    return [
+        {
+            "name": profile_name,
+            "type": "dir",
+            "profile": profile_name,
+            "urls": tag_items(data, profile_name)
+        }
+        for profile_name, data in data_by_profile.items()
+    ]
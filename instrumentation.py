@@ -0,0 +1,216 @@
+"""
+Mesures de temps et compteurs pour le pipeline de chargement et de recherche.
+
+Désactivé par défaut (coût quasi nul). Activation :
+    - variable d'environnement FBM_PROFILE=chemin (ou "-" pour stderr)
+    - option --trace [chemin] de main.py
+
+Le format dépend de l'extension : ".json" produit une trace Chrome
+(chrome://tracing, Perfetto), sinon une ligne JSON par événement.
+FBM_CPROFILE=chemin (ou --cprofile chemin) enveloppe en plus l'exécution
+dans cProfile et écrit les statistiques à la sortie du programme.
+
+Seul le processus qui a activé la mesure enregistre des événements : les
+workers de load_profiles(executor="process") ne sont pas tracés (utiliser
+executor="thread" pour obtenir le détail par profil).
+"""
+import os
+import sys
+import json
+import time
+import atexit
+import functools
+import cProfile
+import threading
+import multiprocessing
+
+_enabled = False
+_output_path = None
+_output_file = None
+_owner_pid = None
+_chrome_format = False
+_events = []
+_counters = {}
+_totals = {}
+_profiler = None
+_cprofile_path = None
+_lock = threading.Lock()
+_start = time.perf_counter()
+
+
+class _NullSpan:
+    """Span utilisé quand la mesure est désactivée."""
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    def __init__(self, name:str, args:dict) -> None:
+        self.name = name
+        self.args = args
+
+    def __enter__(self):
+        self.begin = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        end = time.perf_counter()
+        _record({
+            "name": self.name,
+            "ph": "X",
+            "ts": (self.begin - _start) * 1e6,
+            "dur": (end - self.begin) * 1e6,
+            "pid": os.getpid(),
+            "tid": threading.get_ident(),
+            "args": self.args,
+        })
+        return False
+
+
+def _record(event:dict) -> None:
+    with _lock:
+        if event["ph"] == "X":
+            total = _totals.setdefault(event["name"], [0, 0.0])
+            total[0] += 1
+            total[1] += event["dur"]
+        if _chrome_format:
+            _events.append(event)
+        else:
+            _write_line(event)
+
+
+def _write_line(event:dict) -> None:
+    _output_file.write(json.dumps(event, default=str) + "\n")
+
+
+def _is_owner() -> bool:
+    # Un processus enfant (fork) hérite de l'état mais ne doit rien écrire
+    return os.getpid() == _owner_pid
+
+
+def is_enabled() -> bool:
+    return _enabled and _is_owner()
+
+
+def span(name:str, **args):
+    """
+    Context manager qui mesure la durée d'un bloc.
+
+    Args:
+        name (str): Nom de l'étape (ex: "dao.get_places")
+        **args: Informations supplémentaires enregistrées avec l'événement
+    """
+    if not _enabled or not _is_owner():
+        return _NULL_SPAN
+    return _Span(name, args)
+
+
+def timed(name:str=None):
+    """Décorateur équivalent à span() autour de la fonction."""
+    def decorator(func):
+        span_name = func.__qualname__ if name is None else name
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(span_name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def count(name:str, value:int=1) -> None:
+    """Incrémente un compteur (lignes lues, éléments créés, icônes décodées...)."""
+    if not _enabled or not _is_owner():
+        return
+    with _lock:
+        _counters[name] = _counters.get(name, 0) + value
+        total = _counters[name]
+    _record({
+        "name": name,
+        "ph": "C",
+        "ts": (time.perf_counter() - _start) * 1e6,
+        "pid": os.getpid(),
+        "tid": threading.get_ident(),
+        "args": {name: total},
+    })
+
+
+def summary() -> dict:
+    """Retourne le nombre d'appels et la durée totale (ms) par span, ainsi que les compteurs."""
+    with _lock:
+        return {
+            "spans": {name: {"calls": calls, "total_ms": dur / 1000} for name, (calls, dur) in _totals.items()},
+            "counters": dict(_counters),
+        }
+
+
+def configure(output:str=None, cprofile:str=None) -> None:
+    """
+    Active la mesure.
+
+    Args:
+        output (str): Fichier de sortie (".json" pour une trace Chrome, "-" pour stderr)
+        cprofile (str): Fichier de statistiques cProfile (désactivé si None)
+    """
+    global _enabled, _output_path, _output_file, _chrome_format, _profiler, _cprofile_path, _owner_pid
+    _owner_pid = os.getpid()
+    if output is not None:
+        _close_output()
+        _enabled = True
+        _output_path = output
+        _chrome_format = output.endswith(".json")
+        if not _chrome_format:
+            # Fichier ouvert une seule fois : pas d'ouverture par événement dans les mesures
+            _output_file = sys.stderr if output == "-" else open(output, "w", encoding="utf-8")
+    if cprofile is not None and _profiler is None:
+        _cprofile_path = cprofile
+        _profiler = cProfile.Profile()
+        _profiler.enable()
+
+
+def _close_output() -> None:
+    global _output_file
+    if _output_file is not None and _output_file is not sys.stderr:
+        _output_file.close()
+    _output_file = None
+
+
+def configure_from_env() -> None:
+    configure(output=os.environ.get("FBM_PROFILE") or None, cprofile=os.environ.get("FBM_CPROFILE") or None)
+
+
+def flush() -> None:
+    """Écrit la trace Chrome ou le résumé, ainsi que les statistiques cProfile."""
+    global _profiler, _enabled
+    if not _is_owner():
+        return
+    if _profiler is not None:
+        _profiler.disable()
+        _profiler.dump_stats(_cprofile_path)
+        _profiler = None
+    if not _enabled:
+        return
+    if _chrome_format:
+        with _lock:
+            events = list(_events)
+        with open(_output_path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f, default=str)
+    else:
+        report = summary()
+        with _lock:
+            _write_line({"name": "summary", **report})
+            _close_output()
+    _enabled = False
+
+
+# Les workers "spawn" réimportent ce module : seul le processus principal lit l'environnement.
+# Le nom du processus est fixé avant ces imports, contrairement à parent_process()
+if multiprocessing.current_process().name == "MainProcess":
+    configure_from_env()
+atexit.register(flush)
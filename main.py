@@ -4,9 +4,13 @@ from ui_form import Ui_Widget  # Fichier généré
 from PySide6.QtWidgets import QApplication, QWidget, QTreeWidgetItem, QTreeWidget, QMenu, QAbstractItemView, QMessageBox
 from PySide6.QtGui import QAction, QIcon, QPixmap
 from PySide6.QtCore import Qt, QByteArray, QBuffer
-from formater import convert_to_new_format, sort_by_dir_type, search_bookmarks
+from formater import convert_to_new_format, sort_by_dir_type, search_bookmarks, merge_profiles
+from profiles_ini import discover_profiles
+from profiles import load_profiles
+from instrumentation import span, count, timed, configure
 from urllib.parse import urlparse
 import webbrowser
+import argparse
 
 class CustomTreeWidget(QTreeWidget):
     """QTreeWidget personnalisé pour détecter les drops."""
@@ -75,11 +79,13 @@ class MainWindow(QWidget):
     def load_data(self, data, element:QTreeWidget):
         """Charge les données au nouveau format dans le QTreeWidget."""
         self.data = data
-        element.clear()
+        # Compteurs locaux, publiés une seule fois à la fin du chargement
+        counters = {"dirs": 0, "urls": 0, "icons": 0}
 
         def add_items(items, parent=None):
             for item in items:
                 if item["type"] == "dir":
+                    counters["dirs"] += 1
                     # Créer un élément parent pour le répertoire
                     tree_item = QTreeWidgetItem(parent or element, [item["name"], ""])
                     tree_item.setFlags(tree_item.flags() | Qt.ItemIsEditable | Qt.ItemIsDragEnabled | Qt.ItemIsDropEnabled)
@@ -88,6 +94,9 @@ class MainWindow(QWidget):
                         add_items(item["urls"], tree_item)
                 else:  # type == "url"
                     # Créer un élément pour l'URL
+                    counters["urls"] += 1
+                    if item["icon"] == item["icon"]:
+                        counters["icons"] += 1
                     domain = urlparse(item["url"]).netloc
                     url_item = QTreeWidgetItem(parent or element, [item["name"], domain])
                     url_item.setData(1, 1, item["url"])
@@ -95,7 +104,12 @@ class MainWindow(QWidget):
                     url_item.setIcon(0, icon)
                     url_item.setFlags(url_item.flags() | Qt.ItemIsEditable | Qt.ItemIsDragEnabled)
 
-        add_items(data)
+        with span("main.load_data", element=element.objectName()):
+            element.clear()
+            add_items(data)
+        count("qt.items.dirs", counters["dirs"])
+        count("qt.items.urls", counters["urls"])
+        count("qt.icons_decoded", counters["icons"])
 
     def update_data(self):
         """Met à jour la structure de données en fonction du QTreeWidget."""
@@ -186,7 +200,9 @@ class MainWindow(QWidget):
     def on_live_preview(self, state):
         is_live = state == 2
 
-    def on_search(self):
+    @timed("main.on_search")
+    def on_search(self, *_signal_args):
+        # Le décorateur masque la signature : Qt transmet alors les arguments des signaux, ignorés ici
         search_text = self.ui.search_input_name.text()
         search_url = self.ui.search_input_url.text()
         is_specific_url = self.ui.search_is_specific_url.isChecked()
@@ -219,13 +235,32 @@ class MainWindow(QWidget):
 
 
 if __name__ == '__main__':
-    app = QApplication(sys.argv)
+    parser = argparse.ArgumentParser(description="Firefox Bookmarks Manager")
+    parser.add_argument("--trace", nargs="?", const="fbm_trace.json", default=None,
+                        help="Active les mesures (\".json\" : trace Chrome, sinon JSON lines, \"-\" : stderr)")
+    parser.add_argument("--all-profiles", action="store_true",
+                        help="Charge tous les profils de profiles.ini, regroupés par profil")
+    parser.add_argument("--cprofile", default=None, help="Enregistre les statistiques cProfile dans ce fichier")
+    # Les arguments restants sont transmis à Qt
+    args, qt_args = parser.parse_known_args()
+    configure(output=args.trace, cprofile=args.cprofile)
+
+    app = QApplication(sys.argv[:1] + qt_args)
     window = MainWindow()
 
-    bookmarks = DAO(profile_id="kpnd9nxd.default-release")
-    data_bookmarks = bookmarks.to_dict()
-    data_bookmarks = convert_to_new_format(data_bookmarks)
-    data_bookmarks = sort_by_dir_type(data_bookmarks)
+    if args.all_profiles:
+        # Un répertoire racine par profil ; l'arborescence fusionnée est construite une seule fois
+        data_by_profile, errors = load_profiles(discover_profiles())
+        for profile_id, error in errors.items():
+            print(f"Profil {profile_id} ignoré : {error}", file=sys.stderr)
+        data_bookmarks = merge_profiles(data_by_profile)
+    else:
+        # Le DAO garde ses connexions ouvertes pour toute la session
+        bookmarks = DAO()
+        app.aboutToQuit.connect(bookmarks.close)
+        data_bookmarks = bookmarks.to_dict()
+        data_bookmarks = convert_to_new_format(data_bookmarks)
+        data_bookmarks = sort_by_dir_type(data_bookmarks)
     window.set_bookmarks(data_bookmarks)
 
     window.show()
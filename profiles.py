@@ -0,0 +1,61 @@
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+
+from dao import DAO
+from formater import convert_to_new_format, sort_by_dir_type
+
+
+def load_profile(profile_path:str) -> list:
+    """
+    Charge les marque-pages d'un profil au nouveau format trié.
+    Fonction de niveau module pour pouvoir être envoyée à un ProcessPoolExecutor.
+    """
+    with DAO(firefox_profile_dir_path=profile_path) as dao:
+        data = dao.to_dict()
+    data = convert_to_new_format(data)
+    return sort_by_dir_type(data)
+
+
+def _load_profile_or_error(profile_path:str) -> tuple:
+    # Capture l'erreur pour qu'un profil invalide n'interrompe pas les autres chargements
+    try:
+        return load_profile(profile_path), None
+    except Exception as error:
+        return None, error
+
+
+def load_profiles(profiles:list, executor:str="thread", max_workers:int=None) -> tuple:
+    """
+    Charge plusieurs profils en parallèle.
+    Un profil illisible (entrée obsolète de profiles.ini, base absente...) est
+    signalé dans les erreurs sans empêcher le chargement des autres.
+
+    Args:
+        profiles (list): Liste de Profile à charger (profile_id uniques)
+        executor (str): "thread", "process" ou "serial"
+        max_workers (int): Nombre de workers (défaut de concurrent.futures si None)
+
+    Returns:
+        tuple: (profile_id -> marque-pages au nouveau format, profile_id -> exception),
+        dans l'ordre de profiles
+    """
+    profile_ids = [profile.profile_id for profile in profiles]
+    if len(set(profile_ids)) != len(profile_ids):
+        raise ValueError(f"Profils en double: {profile_ids}")
+    paths = [profile.path for profile in profiles]
+    if executor == "serial":
+        outcomes = [_load_profile_or_error(path) for path in paths]
+    elif executor == "thread":
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            outcomes = list(pool.map(_load_profile_or_error, paths))
+    elif executor == "process":
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            outcomes = list(pool.map(_load_profile_or_error, paths))
+    else:
+        raise ValueError(f"Exécuteur inconnu: {executor}")
+    results, errors = {}, {}
+    for profile_id, (data, error) in zip(profile_ids, outcomes):
+        if error is None:
+            results[profile_id] = data
+        else:
+            errors[profile_id] = error
+    return results, errors
@@ -0,0 +1,97 @@
+import os
+import sys
+import configparser
+from dataclasses import dataclass
+
+
+@dataclass
+class Profile:
+    """Profil Firefox déclaré dans profiles.ini."""
+    name: str
+    path: str
+    is_default: bool = False
+
+    @property
+    def profile_id(self) -> str:
+        # Nom du dossier du profil (ex: "kpnd9nxd.default-release")
+        return os.path.basename(os.path.normpath(self.path))
+
+
+def get_firefox_dir() -> str:
+    """
+    Retourne le dossier racine de Firefox (celui qui contient profiles.ini)
+    selon le système d'exploitation.
+    """
+    if sys.platform.startswith("win"):
+        appdata = os.environ.get("APPDATA")
+        if appdata is None:
+            appdata = os.path.join(os.path.expanduser("~"), "AppData", "Roaming")
+        return os.path.join(appdata, "Mozilla", "Firefox")
+    if sys.platform == "darwin":
+        return os.path.expanduser("~/Library/Application Support/Firefox")
+    return os.path.expanduser("~/.mozilla/firefox")
+
+
+def discover_profiles(firefox_dir:str=None) -> list:
+    """
+    Lit profiles.ini et retourne la liste des profils déclarés.
+
+    Args:
+        firefox_dir (str): Dossier contenant profiles.ini (détecté si None)
+
+    Returns:
+        list: Liste de Profile, le profil par défaut en premier
+    """
+    firefox_dir = get_firefox_dir() if firefox_dir is None else firefox_dir
+    ini_path = os.path.join(firefox_dir, "profiles.ini")
+    if not os.path.exists(ini_path):
+        return []
+
+    config = configparser.ConfigParser(interpolation=None)
+    config.optionxform = str  # Les clés de profiles.ini sont sensibles à la casse
+    config.read(ini_path, encoding="utf-8")
+
+    # Les sections [Install...] désignent le profil par défaut des versions récentes
+    install_defaults = {
+        config[section]["Default"]
+        for section in config.sections()
+        if section.startswith("Install") and "Default" in config[section]
+    }
+
+    profiles = []
+    for section in config.sections():
+        if not section.startswith("Profile") or "Path" not in config[section]:
+            continue
+        entry = config[section]
+        raw_path = entry["Path"]
+        if entry.get("IsRelative", "1") == "1":
+            # Windows utilise "Profiles/xxx", Linux directement "xxx"
+            path = os.path.join(firefox_dir, *raw_path.split("/"))
+        else:
+            path = raw_path
+        if install_defaults:
+            is_default = raw_path in install_defaults
+        else:
+            is_default = entry.get("Default", "0") == "1"
+        profiles.append(Profile(name=entry.get("Name", raw_path), path=path, is_default=is_default))
+
+    profiles.sort(key=lambda p: not p.is_default)
+    return profiles
+
+
+def find_profile(profile_id:str=None, firefox_dir:str=None) -> Profile:
+    """
+    Cherche un profil par son nom ou par le nom de son dossier.
+    Sans profile_id, retourne le profil par défaut.
+    """
+    profiles = discover_profiles(firefox_dir)
+    for profile in profiles:
+        if profile_id is None or profile_id in (profile.name, profile.profile_id):
+            return profile
+    if profile_id is None:
+        raise FileNotFoundError("Aucun profil Firefox trouvé")
+    # Profil absent de profiles.ini : on suppose la disposition standard
+    firefox_dir = get_firefox_dir() if firefox_dir is None else firefox_dir
+    if sys.platform.startswith("win") or sys.platform == "darwin":
+        return Profile(name=profile_id, path=os.path.join(firefox_dir, "Profiles", profile_id))
+    return Profile(name=profile_id, path=os.path.join(firefox_dir, profile_id))
@@ -1,6 +1,6 @@
 from dao import DAO
 
-bookmarks = DAO(profile_id="kpnd9nxd.default-release")
+bookmarks = DAO()
 data_bookmarks = bookmarks.to_dict()
 
 
@@ -0,0 +1,71 @@
+import sqlite3
+
+import pytest
+
+from dao import DAO
+from synthetic import generate_profile
+
+
+@pytest.fixture
+def dao(tmp_path):
+    profile_dir = tmp_path / "profile"
+    generate_profile(str(profile_dir), bookmarks=30, depth=1, history=5, icon_sizes=(16,))
+    with DAO(firefox_profile_dir_path=str(profile_dir)) as dao:
+        yield dao
+
+
+def titles(tree:dict) -> list:
+    found = []
+    for key, value in tree.items():
+        if key == "__files_list__":
+            found.extend(bookmark[1] for bookmark in value)
+        else:
+            found.extend(titles(value))
+    return found
+
+
+def test_update_after_load_on_same_instance(dao):
+    before = titles(dao.to_dict())
+    bookmarks = dao.get_bookmarks()
+    old_title = bookmarks["title"].iloc[0]
+    dao.update_bookmark_title(bookmarks["id"].iloc[0], "Nouveau titre")
+    after = titles(dao.to_dict())
+    assert "Nouveau titre" in after and "Nouveau titre" not in before
+    assert after.count(old_title) == before.count(old_title) - 1
+
+
+def test_update_titles_in_one_transaction(dao):
+    dao.to_dict()
+    ids = [int(i) for i in dao.get_bookmarks()["id"][:5]]
+    for bookmark_id in ids:
+        dao.update_bookmark_title(bookmark_id, f"Vidéo {bookmark_id} - YouTube")
+
+    statements = []
+    dao.connections.write("places").set_trace_callback(statements.append)
+    dao.update_titles(" - YouTube", "")
+
+    loaded = titles(dao.to_dict())
+    assert all(f"Vidéo {bookmark_id}" in loaded for bookmark_id in ids)
+    assert not any(title.endswith(" - YouTube") for title in loaded)
+    assert sum(s.startswith("UPDATE") for s in statements) == len(ids)
+    assert [s for s in statements if s in ("BEGIN ", "COMMIT")] == ["BEGIN ", "COMMIT"]
+
+
+def test_read_connection_rejects_writes_without_blocking_writer(dao):
+    with pytest.raises(sqlite3.OperationalError, match="attempt to write a readonly database"):
+        dao.conn_places.execute("UPDATE moz_bookmarks SET title = 'x'")
+    assert not dao.conn_places.in_transaction
+    # Le lecteur ne garde pas de verrou : l'écriture passe sans attendre busy_timeout
+    dao.connections.BUSY_TIMEOUT_MS = 0
+    dao.update_titles("a", "a")
+
+
+def test_close_then_reuse_reopens_connections(dao):
+    first = dao.conn_places
+    dao.to_dict()
+    dao.close()
+    assert dao.connections.read_connections == {}
+    with pytest.raises(sqlite3.ProgrammingError):
+        first.execute("SELECT 1")
+    assert dao.to_dict()
+    assert dao.conn_places is not first
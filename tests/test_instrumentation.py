@@ -0,0 +1,132 @@
+import os
+import sys
+import json
+import subprocess
+
+import pytest
+
+import instrumentation
+from conftest import ROOT_DIR
+from dao import DAO
+from formater import convert_to_new_format, sort_by_dir_type
+from profiles import load_profile
+from synthetic import generate_firefox_dir, generate_profile
+
+SCRIPT = """
+import multiprocessing
+import instrumentation
+from profiles_ini import discover_profiles
+from profiles import load_profiles
+
+if __name__ == "__main__":
+    multiprocessing.set_start_method("spawn")
+    with instrumentation.span("parent.before"):
+        pass
+    results, errors = load_profiles(discover_profiles({firefox_dir!r}), executor="process", max_workers=2)
+    assert len(results) == 2 and not errors
+    with instrumentation.span("parent.after"):
+        pass
+"""
+
+
+def run_traced(tmp_path, output:str) -> None:
+    firefox_dir = str(tmp_path / "firefox")
+    generate_firefox_dir(firefox_dir, profiles=2, bookmarks=20, depth=1, history=0, icon_sizes=())
+    script = tmp_path / "run.py"
+    script.write_text(SCRIPT.format(firefox_dir=firefox_dir), encoding="utf-8")
+    env = dict(os.environ, FBM_PROFILE=output, PYTHONPATH=ROOT_DIR)
+    subprocess.run([sys.executable, str(script)], check=True, env=env, cwd=str(tmp_path))
+
+
+@pytest.mark.parametrize("extension", [".jsonl", ".json"])
+def test_spawn_workers_do_not_touch_parent_trace(tmp_path, extension):
+    output = str(tmp_path / f"trace{extension}")
+    run_traced(tmp_path, output)
+    with open(output, encoding="utf-8") as f:
+        if extension == ".json":
+            events = json.load(f)["traceEvents"]
+        else:
+            events = [json.loads(line) for line in f]
+    names = [event["name"] for event in events]
+    assert "parent.before" in names and "parent.after" in names
+    assert len({event["pid"] for event in events if "pid" in event}) == 1
+    assert names.count("summary") == (0 if extension == ".json" else 1)
+
+
+BOOKMARKS, HISTORY, ICON_SIZES = 40, 10, (16, 32)
+
+
+@pytest.fixture
+def traced(tmp_path, monkeypatch):
+    # État du module isolé : restauré par monkeypatch après flush()
+    for name, value in (("_enabled", False), ("_totals", {}), ("_counters", {}), ("_events", [])):
+        monkeypatch.setattr(instrumentation, name, value)
+    output = tmp_path / "trace.jsonl"
+    instrumentation.configure(output=str(output))
+    yield output
+    instrumentation.flush()
+
+
+@pytest.fixture
+def profile_dir(tmp_path):
+    path = tmp_path / "profile"
+    generate_profile(str(path), bookmarks=BOOKMARKS, depth=1, history=HISTORY, icon_sizes=ICON_SIZES, icon_ratio=1.0)
+    return str(path)
+
+
+def read_events(output) -> list:
+    instrumentation.flush()
+    with open(output, encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+def test_span_is_noop_when_not_configured(monkeypatch):
+    monkeypatch.setattr(instrumentation, "_enabled", False)
+    monkeypatch.setattr(instrumentation, "_counters", {})
+    assert instrumentation.span("anything") is instrumentation._NULL_SPAN
+    instrumentation.count("anything")
+    assert instrumentation.summary()["counters"] == {}
+
+
+def test_pipeline_spans_and_counters(traced, profile_dir):
+    with DAO(firefox_profile_dir_path=profile_dir) as dao:
+        data = dao.to_dict()
+    sort_by_dir_type(convert_to_new_format(data))
+    report = instrumentation.summary()
+
+    events = read_events(traced)
+    names = {event["name"] for event in events if event.get("ph") == "X"}
+    assert {
+        "dao.get_bookmarks", "dao.get_places", "dao.get_folders", "dao.get_icons",
+        "dao.merge", "dao.to_tuples", "dao.to_list", "dao.to_dict",
+        "formater.convert_to_new_format", "formater.sort_by_dir_type",
+    } <= names
+    counters = report["counters"]
+    assert counters["dao.rows.bookmarks"] == BOOKMARKS
+    assert counters["dao.rows.places"] == BOOKMARKS + HISTORY
+    assert counters["dao.rows.icons"] == (BOOKMARKS + HISTORY) * len(ICON_SIZES)
+    assert counters["dao.rows.folders"] > 0
+    assert events[-1] == {"name": "summary", **report}
+
+
+def test_load_data_spans_and_counters(traced, profile_dir, monkeypatch):
+    pytest.importorskip("PySide6")
+    monkeypatch.setenv("QT_QPA_PLATFORM", "offscreen")
+    monkeypatch.chdir(ROOT_DIR)
+    from PySide6.QtWidgets import QApplication
+    from main import MainWindow
+
+    app = QApplication.instance() or QApplication([])
+    window = MainWindow()
+    # set_bookmarks charge les deux arbres (vue et résultats de recherche)
+    window.set_bookmarks(load_profile(profile_dir))
+    counters = instrumentation.summary()["counters"]
+    assert instrumentation.summary()["spans"]["main.load_data"]["calls"] == 2
+    assert counters["qt.items.urls"] == 2 * BOOKMARKS
+    assert counters["qt.icons_decoded"] == 2 * BOOKMARKS
+    assert counters["qt.items.dirs"] > 0
+
+    window.ui.search_input_name.setText("python")  # déclenche on_search via le signal
+    assert instrumentation.summary()["spans"]["main.on_search"]["calls"] == 1
+    window.deleteLater()
+    del app
@@ -0,0 +1,121 @@
+import os
+import sys
+
+import pytest
+
+from profiles_ini import Profile, discover_profiles, find_profile
+from profiles import load_profiles
+from formater import merge_profiles, search_bookmarks
+from synthetic import generate_profile
+
+
+def write_ini(firefox_dir, content:str) -> None:
+    firefox_dir.mkdir(parents=True, exist_ok=True)
+    (firefox_dir / "profiles.ini").write_text(content, encoding="utf-8")
+
+
+def test_missing_profiles_ini(tmp_path):
+    assert discover_profiles(str(tmp_path)) == []
+
+
+def test_install_default_wins_over_profile_default(tmp_path):
+    write_ini(tmp_path, "\n".join([
+        "[Install4F96D1932A9F858E]", "Default=Profiles/b.default-release", "",
+        "[Profile0]", "Name=default", "IsRelative=1", "Path=Profiles/a.default", "Default=1", "",
+        "[Profile1]", "Name=default-release", "IsRelative=1", "Path=Profiles/b.default-release", "",
+    ]))
+    profiles = discover_profiles(str(tmp_path))
+    assert [p.name for p in profiles] == ["default-release", "default"]
+    assert [p.is_default for p in profiles] == [True, False]
+
+
+def test_profile_default_without_install_section(tmp_path):
+    write_ini(tmp_path, "\n".join([
+        "[Profile0]", "Name=a", "IsRelative=1", "Path=a.default", "",
+        "[Profile1]", "Name=b", "IsRelative=1", "Path=b.default", "Default=1", "",
+    ]))
+    profiles = discover_profiles(str(tmp_path))
+    assert [(p.name, p.is_default) for p in profiles] == [("b", True), ("a", False)]
+
+
+def test_relative_and_absolute_paths(tmp_path):
+    absolute = str(tmp_path / "elsewhere" / "c.custom")
+    write_ini(tmp_path, "\n".join([
+        "[Profile0]", "Name=windows", "IsRelative=1", "Path=Profiles/a.default", "",
+        "[Profile1]", "Name=linux", "IsRelative=1", "Path=b.default", "",
+        "[Profile2]", "Name=absolute", "IsRelative=0", f"Path={absolute}", "",
+    ]))
+    paths = {p.name: p.path for p in discover_profiles(str(tmp_path))}
+    assert paths["windows"] == os.path.join(str(tmp_path), "Profiles", "a.default")
+    assert paths["linux"] == os.path.join(str(tmp_path), "b.default")
+    assert paths["absolute"] == absolute
+
+
+def test_find_profile_by_name_id_and_default(tmp_path):
+    write_ini(tmp_path, "\n".join([
+        "[Profile0]", "Name=work", "IsRelative=1", "Path=x1.work", "",
+        "[Profile1]", "Name=home", "IsRelative=1", "Path=x2.home", "Default=1", "",
+    ]))
+    assert find_profile(firefox_dir=str(tmp_path)).name == "home"
+    assert find_profile("work", firefox_dir=str(tmp_path)).profile_id == "x1.work"
+    assert find_profile("x1.work", firefox_dir=str(tmp_path)).name == "work"
+
+
+@pytest.mark.parametrize("platform, expected", [
+    ("linux", ("unknown.id",)),
+    ("win32", ("Profiles", "unknown.id")),
+])
+def test_find_profile_fallback_for_unknown_id(tmp_path, monkeypatch, platform, expected):
+    write_ini(tmp_path, "[Profile0]\nName=a\nIsRelative=1\nPath=a.default\n")
+    monkeypatch.setattr(sys, "platform", platform)
+    profile = find_profile("unknown.id", firefox_dir=str(tmp_path))
+    assert profile.path == os.path.join(str(tmp_path), *expected)
+
+
+def test_find_default_profile_without_profiles(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        find_profile(firefox_dir=str(tmp_path))
+
+
+def test_load_profiles_reports_broken_profile(tmp_path):
+    good = tmp_path / "good.default"
+    broken = tmp_path / "broken.default"
+    generate_profile(str(good), bookmarks=20, depth=1, history=0, icon_sizes=())
+    broken.mkdir()
+    profiles = [Profile("good", str(good)), Profile("broken", str(broken))]
+    results, errors = load_profiles(profiles, executor="serial")
+    assert list(results) == ["good.default"]
+    assert list(errors) == ["broken.default"]
+
+
+def test_load_profiles_rejects_duplicate_ids(tmp_path):
+    profiles = [Profile("same", str(tmp_path / "a" / "p")), Profile("same", str(tmp_path / "b" / "p"))]
+    with pytest.raises(ValueError):
+        load_profiles(profiles)
+
+
+def test_search_merged_profiles_keeps_attribution(tmp_path):
+    for name in ("a.default", "b.default"):
+        generate_profile(str(tmp_path / name), bookmarks=30, depth=1, history=0, icon_sizes=())
+    profiles = [Profile(name, str(tmp_path / name)) for name in ("a.default", "b.default")]
+    results, errors = load_profiles(profiles, executor="thread")
+    assert errors == {}
+    merged = merge_profiles(results)
+    found = search_bookmarks(merged, name_pattern=".")
+    assert [item["name"] for item in found] == ["a.default", "b.default"]
+
+    def profiles_of(items, profile_id):
+        for item in items:
+            assert item["profile"] == profile_id
+            if item["type"] == "dir":
+                profiles_of(item["urls"], profile_id)
+    for item in found:
+        profiles_of(item["urls"], item["name"])
+
+
+def test_loading_missing_database_does_not_create_it(tmp_path):
+    empty = tmp_path / "empty.default"
+    empty.mkdir()
+    _, errors = load_profiles([Profile("empty", str(empty))], executor="serial")
+    assert list(errors) == ["empty.default"]
+    assert os.listdir(str(empty)) == []
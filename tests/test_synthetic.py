@@ -0,0 +1,46 @@
+import sqlite3
+
+from synthetic import ROOT_FOLDERS, BOOKMARK_ROOTS, generate_profile
+
+BOOKMARKS, HISTORY, DEPTH, FANOUT, ICON_SIZES = 120, 50, 2, 3, (16, 32, 64)
+
+
+def make_profile(tmp_path, icon_ratio:float=1.0):
+    generate_profile(str(tmp_path), bookmarks=BOOKMARKS, depth=DEPTH, fanout=FANOUT,
+                     history=HISTORY, icon_sizes=ICON_SIZES, icon_ratio=icon_ratio, seed=3)
+    return sqlite3.connect(str(tmp_path / "places.sqlite")), sqlite3.connect(str(tmp_path / "favicons.sqlite"))
+
+
+def test_positions_are_contiguous_from_zero(tmp_path):
+    places, _ = make_profile(tmp_path)
+    rows = places.execute("SELECT parent, position FROM moz_bookmarks WHERE id != 1").fetchall()
+    by_parent = {}
+    for parent, position in rows:
+        by_parent.setdefault(parent, []).append(position)
+    for parent, positions in by_parent.items():
+        assert sorted(positions) == list(range(len(positions))), parent
+
+
+def test_counts_match_parameters(tmp_path):
+    places, _ = make_profile(tmp_path)
+    generated_folders = sum(len(BOOKMARK_ROOTS) * FANOUT ** level for level in range(1, DEPTH + 1))
+
+    def scalar(query):
+        return places.execute(query).fetchone()[0]
+    assert scalar("SELECT COUNT(*) FROM moz_bookmarks WHERE type = 1") == BOOKMARKS
+    assert scalar("SELECT COUNT(*) FROM moz_bookmarks WHERE type = 2") == len(ROOT_FOLDERS) + generated_folders
+    assert scalar("SELECT COUNT(*) FROM moz_places") == BOOKMARKS + HISTORY
+    assert scalar("SELECT COUNT(*) FROM moz_places WHERE foreign_count = 0") == HISTORY
+    assert scalar("SELECT COUNT(*) FROM moz_historyvisits") == BOOKMARKS + HISTORY
+
+
+def test_one_icon_per_size_for_each_page(tmp_path):
+    _, favicons = make_profile(tmp_path)
+    assert favicons.execute("SELECT COUNT(*) FROM moz_pages_w_icons").fetchone()[0] == BOOKMARKS + HISTORY
+    widths = {}
+    for page_id, width in favicons.execute(
+        "SELECT mitp.page_id, mi.width FROM moz_icons_to_pages mitp JOIN moz_icons mi ON mi.id = mitp.icon_id"
+    ):
+        widths.setdefault(page_id, []).append(width)
+    assert len(widths) == BOOKMARKS + HISTORY
+    assert all(sorted(sizes) == list(ICON_SIZES) for sizes in widths.values())